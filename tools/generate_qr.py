@@ -11,16 +11,57 @@ Usage:
     python tools/generate_qr.py --content "+1-555-123-4567" --label "Office Phone"
     python tools/generate_qr.py --content "WIFI:T:WPA;S:MyNetwork;P:MyPassword;;" --label "Home WiFi"
     python tools/generate_qr.py --content "Hello World" --type text
+    python tools/generate_qr.py --content-file codes.txt --workers 4
 """
 
 import argparse
+import importlib.util
 import os
 import re
 import subprocess
 import sys
-import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from datetime import date
 
+# Third-party imports happen once at module scope; on a fresh machine they are
+# missing until ensure_dependencies() installs them, which then binds these
+# names.
+try:
+    import numpy as np
+    import qrcode
+    from fpdf import FPDF
+    from fpdf.enums import XPos, YPos
+    from PIL import Image
+    from qrcode.constants import ERROR_CORRECT_H
+except ImportError:
+    np = qrcode = FPDF = XPos = YPos = Image = ERROR_CORRECT_H = None
+
+# Patterns used by detect_type, compiled once. Literal prefixes (http://,
+# mailto:, tel:, ...) are checked with str.startswith instead.
+_URL_PREFIXES = ("http://", "https://")
+_PREFIX_LEN = len("https://")  # longest literal prefix checked
+_EMAIL_RE = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+_PHONE_RE = re.compile(r'^\+?[\d\s\-\(\)]{7,}$')
+
+
+class _FilenameTable(dict):
+    """str.translate table for make_filename: keeps word characters,
+    whitespace and '-', drops everything else. Filled lazily per code point."""
+
+    def __missing__(self, cp):
+        ch = chr(cp)
+        self[cp] = cp if ch.isalnum() or ch.isspace() or ch in "_-" else None
+        return self[cp]
+
+
+_FNAME_TABLE = _FilenameTable()
+
+QR_TYPES = ["url", "text", "email", "phone", "wifi", "other"]
+
+# White border around the code, in modules. 4 is the QR spec minimum — don't
+# shrink it.
+QUIET_ZONE = 4
+
 
 # ---------------------------------------------------------------------------
 # Dependency management — auto-install if missing
@@ -28,19 +69,16 @@ from datetime import date
 
 def ensure_dependencies():
     """Install missing dependencies so Paul never has to touch pip."""
-    missing = []
-    try:
-        import qrcode  # noqa: F401
-    except ImportError:
-        missing.append("qrcode[pil]")
-    try:
-        from fpdf import FPDF  # noqa: F401
-    except ImportError:
-        missing.append("fpdf2")
-    try:
-        from PIL import Image  # noqa: F401
-    except ImportError:
-        missing.append("Pillow")
+    global np, qrcode, FPDF, XPos, YPos, Image, ERROR_CORRECT_H
+
+    # find_spec only locates the package; it does not execute the module.
+    missing = [
+        pkg
+        for mod, pkg in (
+            ("qrcode", "qrcode[pil]"), ("fpdf", "fpdf2"), ("PIL", "Pillow"), ("numpy", "numpy"),
+        )
+        if importlib.util.find_spec(mod) is None
+    ]
 
     if missing:
         print(f"Installing missing libraries: {', '.join(missing)}...")
@@ -51,6 +89,18 @@ def ensure_dependencies():
                 stderr=subprocess.DEVNULL,
             )
         print("Done.\n")
+        importlib.invalidate_caches()
+
+    # The module-level imports failed: either a package was just installed,
+    # or one is present but broken (e.g. legacy PyFPDF without fpdf.enums).
+    # Import unguarded so the real ImportError surfaces in the second case.
+    if qrcode is None:
+        import numpy as np
+        import qrcode
+        from fpdf import FPDF
+        from fpdf.enums import XPos, YPos
+        from PIL import Image
+        from qrcode.constants import ERROR_CORRECT_H
 
 
 # ---------------------------------------------------------------------------
@@ -60,19 +110,20 @@ def ensure_dependencies():
 def detect_type(content: str) -> str:
     """Auto-detect the QR content type from the string."""
     c = content.strip()
-    if c.upper().startswith("WIFI:"):
-        return "wifi"
-    if re.match(r'^https?://', c, re.IGNORECASE):
-        return "url"
-    if re.match(r'^www\.', c, re.IGNORECASE):
+    # Only the head is needed for the prefix checks; URLs (most common) first.
+    cl = c[:_PREFIX_LEN].lower()
+    if cl.startswith(_URL_PREFIXES) or cl.startswith("www."):
         return "url"
-    if re.match(r'^mailto:', c, re.IGNORECASE):
-        return "email"
-    if re.match(r'^[^@\s]+@[^@\s]+\.[^@\s]+$', c):
+    if cl.startswith("mailto:"):
         return "email"
-    if re.match(r'^tel:', c, re.IGNORECASE):
+    if cl.startswith("tel:"):
         return "phone"
-    if re.match(r'^\+?[\d\s\-\(\)]{7,}$', c):
+    if cl.startswith("wifi:"):
+        return "wifi"
+    # No literal prefix: fall back to the pattern checks.
+    if _EMAIL_RE.match(c):
+        return "email"
+    if _PHONE_RE.match(c):
         return "phone"
     return "text"
 
@@ -84,14 +135,15 @@ def detect_type(content: str) -> str:
 def format_content(content: str, qr_type: str) -> str:
     """Add standard prefixes (mailto:, tel:, https://) as needed."""
     c = content.strip()
+    cl = c[:_PREFIX_LEN].lower()
     if qr_type == "url":
-        if not re.match(r'^https?://', c, re.IGNORECASE):
+        if not cl.startswith(_URL_PREFIXES):
             c = "https://" + c
     elif qr_type == "email":
-        if not c.lower().startswith("mailto:"):
+        if not cl.startswith("mailto:"):
             c = "mailto:" + c
     elif qr_type == "phone":
-        if not c.lower().startswith("tel:"):
+        if not cl.startswith("tel:"):
             c = "tel:" + c
     return c
 
@@ -101,61 +153,127 @@ def format_content(content: str, qr_type: str) -> str:
 # ---------------------------------------------------------------------------
 
 def generate_qr_image(data: str):
-    """Generate a QR code as a PIL Image."""
-    import qrcode
-    from qrcode.constants import ERROR_CORRECT_H
-
+    """Generate a QR code as a 1-bit (mode "1") PIL Image."""
+    # box_size is pixels per module. The PDF scales the image to 100mm anyway,
+    # so it only sizes the PNG: 10 keeps it crisp when printed or zoomed, and
+    # a smaller value still scans fine on screen.
     qr = qrcode.QRCode(
         version=None,
         error_correction=ERROR_CORRECT_H,
         box_size=10,
-        border=4,
+        border=0,
     )
     qr.add_data(data)
     qr.make(fit=True)
-    return qr.make_image(fill_color="black", back_color="white").convert("RGB")
+    # The quiet zone is added here with numpy rather than by qrcode, whose
+    # get_matrix() pads the module rows as Python lists.
+    modules = np.pad(np.asarray(qr.get_matrix(), dtype=bool), QUIET_ZONE)
+    shape = (modules.shape[0] * qr.box_size, modules.shape[1] * qr.box_size)
+    return Image.fromarray(expand_modules(modules, qr.box_size, out=_scratch_pixels(shape)))
+
+
+def expand_modules(modules, box_size: int, out=None):
+    """Expand a module matrix (True = dark) to 1-bit pixels (True = white).
+
+    Writes into `out` if given, which must already have the full pixel shape.
+    """
+    h, w = modules.shape
+    if out is None:
+        out = np.empty((h * box_size, w * box_size), dtype=bool)
+    # Widen each module row once, then copy it into its box_size pixel rows.
+    rows = (~modules).repeat(box_size, axis=1)
+    out.reshape(h, box_size, w * box_size)[...] = rows[:, np.newaxis, :]
+    return out
+
+
+def _scratch_pixels(shape):
+    """Return this batch worker's reusable pixel buffer, or None elsewhere.
+
+    URL lists usually share one QR version, so the buffer is only
+    reallocated when the pixel shape changes.
+    """
+    if _SCRATCH is None:
+        return None
+    pixels = _SCRATCH.get("pixels")
+    if pixels is None or pixels.shape != shape:
+        pixels = _SCRATCH["pixels"] = np.empty(shape, dtype=bool)
+    return pixels
 
 
 # ---------------------------------------------------------------------------
 # Filename helpers
 # ---------------------------------------------------------------------------
 
-def make_filename(label: str) -> str:
-    """Create a safe filename from the label + today's date."""
-    safe = re.sub(r'[^\w\s\-]', '', label)[:50].strip()
-    safe = re.sub(r'\s+', '-', safe).lower()
+def make_filename(label: str, iso_date: str) -> str:
+    """Create a safe filename from the label + a YYYY-MM-DD date."""
+    safe = label.translate(_FNAME_TABLE)[:50].strip()
+    safe = "-".join(safe.split()).lower()
     if not safe:
         safe = "qr-code"
-    today = date.today().isoformat()
-    return f"{safe}_{today}"
+    return f"{safe}_{iso_date}"
+
+
+_ARCHIVE_READY = False
 
 
-def resolve_paths(archive_dir: str, base_name: str):
-    """Return (png_path, pdf_path), handling collisions."""
-    png_path = os.path.join(archive_dir, f"{base_name}.png")
-    pdf_path = os.path.join(archive_dir, f"{base_name}.pdf")
+def ensure_archive_dir() -> str:
+    """Return the archive directory, creating it once per process."""
+    global _ARCHIVE_READY
+    site_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    archive_dir = os.path.join(site_root, "archive")
+    if not _ARCHIVE_READY:
+        os.makedirs(archive_dir, exist_ok=True)
+        _ARCHIVE_READY = True
+    return archive_dir
+
+
+def list_archive(archive_dir: str):
+    """Return the set of filenames in the archive (one directory read)."""
+    return {os.path.normcase(entry.name) for entry in os.scandir(archive_dir)}
+
+
+def resolve_paths(archive_dir: str, base_name: str, taken=None):
+    """Return (png_path, pdf_path), handling collisions.
+
+    `taken` is the set of filenames already in use, from list_archive(); the
+    chosen names are added to it, so batch mode can share one set across
+    items. Scanned from the archive directory if omitted.
+    """
+    if taken is None:
+        taken = list_archive(archive_dir)
+    png_name = f"{base_name}.png"
+    pdf_name = f"{base_name}.pdf"
 
     counter = 2
-    while os.path.exists(png_path) or os.path.exists(pdf_path):
-        png_path = os.path.join(archive_dir, f"{base_name}-{counter}.png")
-        pdf_path = os.path.join(archive_dir, f"{base_name}-{counter}.pdf")
+    while os.path.normcase(png_name) in taken or os.path.normcase(pdf_name) in taken:
+        png_name = f"{base_name}-{counter}.png"
+        pdf_name = f"{base_name}-{counter}.pdf"
         counter += 1
 
-    return png_path, pdf_path
+    taken.update((os.path.normcase(png_name), os.path.normcase(pdf_name)))
+    return os.path.join(archive_dir, png_name), os.path.join(archive_dir, pdf_name)
 
 
 # ---------------------------------------------------------------------------
 # PDF generation
 # ---------------------------------------------------------------------------
 
-def create_pdf(qr_image, label: str, content: str, qr_type: str, output_path: str):
-    """Create a PDF with the QR code, label, encoded content, and date."""
-    from fpdf import FPDF
-    from fpdf.enums import XPos, YPos
+def _build_base_pdf():
+    """Return a letter-size FPDF with one blank page and no auto page break.
 
+    Built fresh for every PDF: constructing one is cheaper than deep-copying
+    a cached template, and an FPDF can't be reused after output().
+    """
     pdf = FPDF(orientation="P", unit="mm", format="letter")
     pdf.set_auto_page_break(auto=False)
     pdf.add_page()
+    return pdf
+
+
+def create_pdf(qr_image, label: str, content: str, qr_type: str, output_path: str,
+               pretty_date: str):
+    """Create a PDF with the QR code, label, encoded content, and date."""
+    pdf = _build_base_pdf()
 
     # Title
     pdf.set_font("Helvetica", "B", 24)
@@ -167,58 +285,156 @@ def create_pdf(qr_image, label: str, content: str, qr_type: str, output_path: st
     pdf.cell(0, 8, text=f"Type: {qr_type.upper()}", new_x=XPos.LMARGIN, new_y=YPos.NEXT, align="C")
     pdf.ln(10)
 
-    # Save QR image to temp file for embedding
-    tmp_path = None
-    try:
-        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp:
-            tmp_path = tmp.name
-            qr_image.save(tmp_path)
-
-        # Center the QR code — 100mm wide (~4 inches, large and scannable)
-        page_width = pdf.w - pdf.l_margin - pdf.r_margin
-        qr_size = 100
-        x_offset = (page_width - qr_size) / 2 + pdf.l_margin
-        pdf.image(tmp_path, x=x_offset, y=pdf.get_y(), w=qr_size, h=qr_size)
-        pdf.ln(qr_size + 10)
-    finally:
-        if tmp_path and os.path.exists(tmp_path):
-            os.unlink(tmp_path)
-
-    # Encoded content
-    pdf.set_font("Helvetica", "", 11)
+    # Center the QR code — 100mm wide (~4 inches, large and scannable)
+    page_width = pdf.w - pdf.l_margin - pdf.r_margin
+    qr_size = 100
+    x_offset = (page_width - qr_size) / 2 + pdf.l_margin
+    pdf.image(qr_image, x=x_offset, y=pdf.get_y(), w=qr_size, h=qr_size)
+    pdf.ln(qr_size + 10)
+
+    # Encoded content (same face as the type badge, so only the size changes)
+    pdf.set_font_size(11)
     pdf.multi_cell(0, 7, text=f"Encoded: {content}", align="C")
     pdf.ln(5)
 
     # Date
     pdf.set_font("Helvetica", "I", 10)
-    today = date.today().strftime("%B %d, %Y")
-    pdf.cell(0, 8, text=f"Created: {today}", new_x=XPos.LMARGIN, new_y=YPos.NEXT, align="C")
+    pdf.cell(0, 8, text=f"Created: {pretty_date}", new_x=XPos.LMARGIN, new_y=YPos.NEXT, align="C")
 
     pdf.output(output_path)
 
 
+# ---------------------------------------------------------------------------
+# Generate one QR code (PNG + PDF)
+# ---------------------------------------------------------------------------
+
+def generate_one(encoded_content: str, label: str, qr_type: str, png_path: str, pdf_path: str,
+                 pretty_date: str):
+    """Write the PNG and PDF for one QR code. Runs in a worker in batch mode."""
+    qr_image = generate_qr_image(encoded_content)
+
+    # Save PNG
+    qr_image.save(png_path, format="PNG")
+
+    # Save PDF (fpdf2 embeds the 1-bit image directly, no PNG round-trip)
+    create_pdf(qr_image, label, encoded_content, qr_type, pdf_path, pretty_date)
+    return png_path, pdf_path
+
+
+# ---------------------------------------------------------------------------
+# Batch input
+# ---------------------------------------------------------------------------
+
+# Per-process scratch buffers; only set in batch workers (see _init_worker).
+_SCRATCH = None
+
+
+def _init_worker():
+    """ProcessPoolExecutor initializer: enable buffer reuse in this worker."""
+    global _SCRATCH
+    _SCRATCH = {}
+
+
+def read_content_file(path: str):
+    """Read batch items from a text file, one QR code per line.
+
+    Each line is `content`, optionally followed by a tab and a label, and
+    another tab and a type. Blank lines are skipped.
+    """
+    items = []
+    # utf-8-sig drops the byte-order mark Windows Notepad puts at the start.
+    try:
+        f = open(path, encoding="utf-8-sig")
+    except OSError as e:
+        sys.exit(f"{path}: {e.strerror or e}")
+    with f:
+        try:
+            lines = f.readlines()
+        except UnicodeDecodeError:
+            sys.exit(f"{path}: not UTF-8 text (save it as UTF-8 and try again)")
+        for line_no, line in enumerate(lines, 1):
+            line = line.rstrip("\r\n")
+            if not line.strip():
+                continue
+            fields = line.split("\t")
+            content = fields[0]
+            label = fields[1].strip() if len(fields) > 1 and fields[1].strip() else None
+            qr_type = fields[2].strip().lower() if len(fields) > 2 and fields[2].strip() else None
+            if qr_type is not None and qr_type not in QR_TYPES:
+                sys.exit(f"{path}:{line_no}: unknown type '{qr_type}' (expected one of: {', '.join(QR_TYPES)})")
+            items.append((content, label, qr_type))
+    return items
+
+
+def _generate_batch_item(encoded_content: str, label: str, qr_type: str, png_path: str,
+                         pdf_path: str, pretty_date: str):
+    """generate_one() for a batch worker.
+
+    Removes any half-written output on failure and re-raises as a plain
+    RuntimeError: some library exceptions (e.g. fpdf2's) can't be unpickled
+    in the parent, which would break the whole pool.
+    """
+    try:
+        return generate_one(encoded_content, label, qr_type, png_path, pdf_path, pretty_date)
+    except Exception as e:
+        for path in (png_path, pdf_path):
+            if os.path.exists(path):
+                os.unlink(path)
+        raise RuntimeError(f"{type(e).__name__}: {e}") from None
+
+
+def default_workers() -> int:
+    """CPU count, capped at 61 on Windows (ProcessPoolExecutor's limit there)."""
+    workers = os.cpu_count() or 1
+    if sys.platform == "win32":
+        workers = min(workers, 61)
+    return workers
+
+
 # ---------------------------------------------------------------------------
 # Argument parsing
 # ---------------------------------------------------------------------------
 
+def _positive_int(value: str) -> int:
+    try:
+        n = int(value)
+    except ValueError:
+        n = 0
+    if n < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive whole number, got '{value}'")
+    return n
+
+
 def parse_args():
     parser = argparse.ArgumentParser(
         description="Generate a QR code and save as PNG + PDF to the archive."
     )
-    parser.add_argument(
-        "--content", required=True,
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument(
+        "--content",
         help="The data to encode (URL, text, email, phone, WiFi string, etc.)"
     )
+    source.add_argument(
+        "--content-file",
+        help="Batch mode: a text file with one QR per line (content[TAB label[TAB type]])."
+    )
     parser.add_argument(
         "--label", default=None,
         help="Human-readable label for the PDF title and filename. Defaults to the content."
     )
     parser.add_argument(
         "--type", default=None, dest="qr_type",
-        choices=["url", "text", "email", "phone", "wifi", "other"],
+        choices=QR_TYPES,
         help="Content type. Auto-detected if omitted."
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--workers", type=_positive_int, default=None,
+        help="Batch mode: number of worker processes. Defaults to the CPU count."
+    )
+    args = parser.parse_args()
+    if args.content_file and args.label is not None:
+        parser.error("--label can't be used with --content-file; put labels in the file instead")
+    return args
 
 
 # ---------------------------------------------------------------------------
@@ -230,41 +446,67 @@ def main():
 
     args = parse_args()
 
-    # Resolve type and label
-    qr_type = args.qr_type or detect_type(args.content)
-    label = args.label or args.content
-
-    # Format content for QR encoding
-    encoded_content = format_content(args.content, qr_type)
-
-    # Generate QR image
-    qr_image = generate_qr_image(encoded_content)
+    if args.content_file:
+        items = read_content_file(args.content_file)
+        if not items:
+            sys.exit(f"{args.content_file}: no QR codes to generate")
+    else:
+        items = [(args.content, args.label, args.qr_type)]
 
     # Set up archive directory
-    site_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    archive_dir = os.path.join(site_root, "archive")
-    os.makedirs(archive_dir, exist_ok=True)
-
-    # Build output paths (with collision handling)
-    base_name = make_filename(label)
-    png_path, pdf_path = resolve_paths(archive_dir, base_name)
-
-    # Save PNG
-    qr_image.save(png_path)
-
-    # Save PDF
-    create_pdf(qr_image, label, encoded_content, qr_type, pdf_path)
+    archive_dir = ensure_archive_dir()
+
+    # Format today's date once, for the filename and the PDF footer
+    today = date.today()
+    iso_date = today.isoformat()
+    pretty_date = today.strftime("%B %d, %Y")
+
+    # Resolve type, label, encoded content and output paths up front so that
+    # parallel workers never race on the same filename.
+    jobs = []
+    taken = list_archive(archive_dir)
+    for content, label, qr_type in items:
+        qr_type = qr_type or args.qr_type or detect_type(content)
+        label = label or content
+        encoded_content = format_content(content, qr_type)
+        png_path, pdf_path = resolve_paths(archive_dir, make_filename(label, iso_date), taken)
+        jobs.append((encoded_content, label, qr_type, png_path, pdf_path))
+
+    failed = []
+    if not args.content_file:
+        generate_one(*jobs[0], pretty_date)
+        done = jobs
+    else:
+        # One bad line must not take down the rest of the batch.
+        workers = min(args.workers or default_workers(), len(jobs))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as ex:
+            futures = [ex.submit(_generate_batch_item, *job, pretty_date) for job in jobs]
+        done = []
+        for job, future in zip(jobs, futures):
+            try:
+                future.result()
+            except Exception as e:
+                failed.append((job[1], str(e)))
+            else:
+                done.append(job)
 
     # Summary
-    print(f"\n{'='*50}")
-    print(f"QR CODE GENERATED!")
-    print(f"{'='*50}")
-    print(f"  Label:   {label}")
-    print(f"  Type:    {qr_type}")
-    print(f"  Content: {encoded_content}")
-    print(f"  PNG:     {png_path}")
-    print(f"  PDF:     {pdf_path}")
-    print(f"{'='*50}\n")
+    if done:
+        print(f"\n{'='*50}")
+        print("QR CODE GENERATED!" if len(done) == 1 else f"{len(done)} QR CODES GENERATED!")
+        for encoded_content, label, qr_type, png_path, pdf_path in done:
+            print(f"{'='*50}")
+            print(f"  Label:   {label}")
+            print(f"  Type:    {qr_type}")
+            print(f"  Content: {encoded_content}")
+            print(f"  PNG:     {png_path}")
+            print(f"  PDF:     {pdf_path}")
+        print(f"{'='*50}\n")
+
+    if failed:
+        for label, message in failed:
+            print(f"FAILED  {label}: {message}", file=sys.stderr)
+        sys.exit(f"{len(failed)} of {len(jobs)} QR codes failed.")
 
 
 if __name__ == "__main__":